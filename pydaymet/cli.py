@@ -1,16 +1,21 @@
 """Command-line interface for PyDaymet."""
 from __future__ import annotations
 
-import itertools
+import importlib.util
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import TYPE_CHECKING, Iterable, Literal, TypeVar
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Literal, TypeVar
 
 import click
 import geopandas as gpd
+import numpy as np
 import pandas as pd
-import shapely.geometry as sgeom
+import pyproj
+import shapely
+from packaging.version import Version
 
 from pydaymet import pydaymet as daymet
+from pydaymet.core import REGION_BBOX
 from pydaymet.exceptions import (
     InputRangeError,
     InputTypeError,
@@ -20,10 +25,27 @@ from pydaymet.exceptions import (
 )
 
 if TYPE_CHECKING:
-    from shapely import MultiPolygon, Point, Polygon
+    from click._termui_impl import ProgressBar
 
     DFType = TypeVar("DFType", pd.DataFrame, gpd.GeoDataFrame)
 
+try:
+    import pyogrio
+except ImportError:
+    has_pyogrio = False
+else:
+    # Reading with a mask using pyogrio requires pyogrio>=0.7 and geopandas>=0.14
+    has_pyogrio = Version(pyogrio.__version__) >= Version("0.7") and Version(
+        gpd.__version__
+    ) >= Version("0.14")
+has_pyarrow = importlib.util.find_spec("pyarrow") is not None
+
+CSV_CHUNKSIZE = 1024
+# Each request already retrieves its files concurrently, so keep this small
+MAX_WORKERS = 4
+
+DAYMET_EXTENT = shapely.unary_union(list(REGION_BBOX.values()))
+
 
 def parse_snow(target_df: pd.DataFrame) -> pd.DataFrame:
     """Parse the snow dataframe."""
@@ -46,31 +68,124 @@ def get_target_df(tdf: DFType, req_cols: list[str]) -> DFType:
     return tdf[req_cols]  # pyright: ignore[reportGeneralTypeIssues]
 
 
-def get_required_cols(geom_type: str, columns: pd.Index) -> list[str]:
-    """Get the required columns for a given geometry type."""
-    req_cols = ["id", geom_type, "dates", "region"]
-    return req_cols + list({"time_scale", "pet", "snow"}.intersection(columns))
+def _region_bounds() -> str:
+    """Get the bounds of the Daymet regions as a string."""
+    return "\n".join(f"{r.upper()}: {b.bounds}" for r, b in REGION_BBOX.items())
+
+
+def check_crs(crs: pyproj.CRS | str | None) -> None:
+    """Check if the CRS of an input file is defined."""
+    if crs is None or "undefined geographic" in pyproj.CRS(crs).name.lower():
+        raise MissingCRSError
+
+
+def read_geo(fpath: Path) -> gpd.GeoDataFrame:
+    """Read the features of a vector file that intersect the Daymet extent.
+
+    The file is read using ``pyogrio`` if it's installed, otherwise ``fiona``.
+    With ``pyogrio`` and a geographic CRS, only the features that intersect
+    the Daymet extent are read, using the spatial index of the file. In all
+    cases, the features that are entirely outside the Daymet extent are
+    skipped and an ``InputRangeError`` is raised if none of them are inside.
+    """
+    if has_pyogrio:
+        info = pyogrio.read_info(fpath)
+        check_crs(info["crs"])
+        # The mask is reprojected to the file's CRS using only its corners,
+        # so it's only accurate for geographic CRS.
+        if pyproj.CRS(info["crs"]).is_geographic:
+            mask = gpd.GeoSeries([DAYMET_EXTENT], crs=4326)
+        else:
+            mask = None
+        geodf = gpd.read_file(fpath, engine="pyogrio", use_arrow=has_pyarrow, mask=mask)
+        n_features = info["features"]
+    else:
+        geodf = gpd.read_file(fpath)
+        check_crs(geodf.crs)
+        n_features = len(geodf)
+
+    geodf = geodf[shapely.intersects(DAYMET_EXTENT, geodf.to_crs(4326).geometry.to_numpy())]
+    if n_features > 0 and geodf.empty:
+        geo_id = "all geometries"
+        raise InputRangeError(geo_id, f"within\n{_region_bounds()}")
+    n_skipped = n_features - len(geodf)
+    if n_skipped > 0:
+        count = "1 geometry" if n_skipped == 1 else f"{n_skipped} geometries"
+        click.echo(f"Skipped {count} outside the Daymet extent.")
+    return geodf
+
+
+def get_optional_cols(columns: pd.Index) -> list[str]:
+    """Get the optional columns that exist in the dataframe."""
+    return [c for c in ("time_scale", "pet", "snow") if c in columns]
+
+
+def read_coords(fpath: Path) -> Iterator[pd.DataFrame]:
+    """Read the input csv file of the ``coords`` command in chunks."""
+    return pd.read_csv(
+        fpath,
+        chunksize=CSV_CHUNKSIZE,
+        dtype={"id": str, "lon": np.float64, "lat": np.float64},
+    )
 
 
-def _get_region(gid: str, geom: Polygon | MultiPolygon | Point) -> str:
-    """Get the Daymer region of an input geometry (point or polygon)."""
-    region_bbox = {
-        "na": sgeom.box(-136.8989, 6.0761, -6.1376, 69.077),
-        "hi": sgeom.box(-160.3055, 17.9539, -154.7715, 23.5186),
-        "pr": sgeom.box(-67.9927, 16.8443, -64.1195, 19.9381),
-    }
-    for region, bbox in region_bbox.items():
-        if bbox.contains(geom):
-            return region
-    bbox_range = "\n".join(f"{k.upper()}: {v.bounds}" for k, v in region_bbox.items())
-    geo_id = f"geometry ID of {gid}"
-    raise InputRangeError(geo_id, f"within\n{bbox_range}")
+def parse_coords(coords_df: pd.DataFrame) -> pd.DataFrame:
+    """Get the target dataframe of the ``coords`` command from a chunk of the input csv."""
+    target_df = get_target_df(coords_df, ["id", "start", "end", "lon", "lat"])
+    lon, lat = target_df["lon"].to_numpy(), target_df["lat"].to_numpy()
+    points = gpd.GeoDataFrame(target_df[["id"]], geometry=shapely.points(lon, lat), crs=4326)
+    target_df["region"] = get_region(points)
+    if "snow" in target_df:
+        target_df = parse_snow(target_df)
+    return target_df
 
 
 def get_region(geodf: gpd.GeoDataFrame) -> list[str]:
     """Get the Daymer region of a geo-dataframe."""
-    id_geo = geodf[["id", "geometry"]].itertuples(index=False, name=None)
-    return list(itertools.starmap(_get_region, id_geo))
+    regions = np.array(list(REGION_BBOX))
+    region_bbox = np.array(list(REGION_BBOX.values()))
+    geoms = geodf.to_crs(4326).geometry.to_numpy()
+    within = shapely.contains(region_bbox[:, np.newaxis], geoms[np.newaxis, :])
+    outside = ~within.any(axis=0)
+    if outside.any():
+        geo_id = f"geometry ID of {', '.join(geodf['id'].astype(str)[outside])}"
+        raise InputRangeError(geo_id, f"within\n{_region_bounds()}")
+    return regions[within.argmax(axis=0)].tolist()
+
+
+def _save_bycoords(
+    fname: Path,
+    kwrgs: dict[str, Any],
+    variables: Iterable[str] | str | None,
+    ssl: bool,
+) -> None:
+    """Get climate data for a single coordinate and save it to a csv file."""
+    clm = daymet.get_bycoords(**kwrgs, variables=variables, ssl=ssl)
+    clm.to_csv(fname, index=False)
+
+
+def _save_bygeom(
+    fname: Path,
+    kwrgs: dict[str, Any],
+    crs: pyproj.CRS,
+    variables: Iterable[str] | str | None,
+    ssl: bool,
+) -> None:
+    """Get gridded climate data for a single geometry and save it to a netcdf file."""
+    clm = daymet.get_bygeom(**kwrgs, crs=crs, variables=variables, ssl=ssl)
+    clm.to_netcdf(fname)
+
+
+def _wait_for(futures: list[Future[None]], bar: ProgressBar[Any]) -> None:
+    """Wait for the requests to finish and cancel the pending ones if one fails."""
+    try:
+        for future in as_completed(futures):
+            future.result()
+            bar.update(1)
+    except BaseException:
+        for future in futures:
+            future.cancel()
+        raise
 
 
 variables_opt = click.option(
@@ -144,35 +259,37 @@ def coords(
     if fpath.suffix != ".csv":
         raise InputTypeError("file", ".csv")
 
-    target_df = get_target_df(pd.read_csv(fpath), ["id", "start", "end", "lon", "lat"])
-    points = gpd.GeoDataFrame(
-        target_df.id, geometry=gpd.points_from_xy(target_df.lon, target_df.lat), crs=4326
-    )
-    target_df["region"] = get_region(points)
-    target_df["dates"] = list(target_df[["start", "end"]].itertuples(index=False, name=None))
-    target_df["coords"] = list(target_df[["lon", "lat"]].itertuples(index=False, name=None))
-    if "snow" in target_df:
-        target_df = parse_snow(target_df)
-
-    req_cols = get_required_cols("coords", target_df.columns)
-    target_df = target_df[req_cols]
-
-    count = "1 point" if len(target_df) == 1 else f"{len(target_df)} points"
+    # Validate all the rows before sending any request
+    n_pts = sum(len(parse_coords(chunk)) for chunk in read_coords(fpath))
+    count = "1 point" if n_pts == 1 else f"{n_pts} points"
     click.echo(f"Found coordinates of {count} in {fpath.resolve()}.")
 
     Path(save_dir).mkdir(parents=True, exist_ok=True)
     with click.progressbar(
-        target_df.itertuples(index=False, name=None),
-        label="Getting single-pixel climate data",
-        length=len(target_df),
-    ) as bar:
-        for i, *args in bar:
-            fname = Path(save_dir, f"{i}.csv")
-            if fname.exists():
-                continue
-            kwrgs = dict(zip(req_cols[1:], args))
-            clm = daymet.get_bycoords(**kwrgs, variables=variables, ssl=not disable_ssl)
-            clm.to_csv(fname, index=False)
+        length=n_pts, label="Getting single-pixel climate data"
+    ) as bar, ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        for chunk in read_coords(fpath):
+            target_df = parse_coords(chunk)
+            opt_cols = get_optional_cols(target_df.columns)
+            req_cols = ["id", "lon", "lat", "start", "end", "region", *opt_cols]
+            futures = []
+            for i, lon, lat, start, end, region, *args in zip(
+                *(target_df[c].to_numpy() for c in req_cols)
+            ):
+                fname = Path(save_dir, f"{i}.csv")
+                if fname.exists():
+                    bar.update(1)
+                    continue
+                kwrgs = {
+                    "coords": (lon, lat),
+                    "dates": (start, end),
+                    "region": region,
+                    **dict(zip(opt_cols, args)),
+                }
+                futures.append(
+                    executor.submit(_save_bycoords, fname, kwrgs, variables, not disable_ssl)
+                )
+            _wait_for(futures, bar)
     click.echo("Done.")
 
 
@@ -203,6 +320,12 @@ def geometry(
                    ``penman_monteith``, ``hargreaves_samani``, ``priestley_taylor``, and ``none`` (default).
         - ``snow``: (optional) Separate snowfall from precipitation, default is ``False``.
 
+    \b
+    Features that are entirely outside the Daymet extent are skipped, and
+    an error is raised if none of them are inside it. Features that are
+    not within a single Daymet region (North America, Hawaii, or
+    Puerto Rico) also raise an error.
+
     \b
     Examples:
         $ pydaymet geometry geo.gpkg -v prcp -v tmin
@@ -211,38 +334,34 @@ def geometry(
     if fpath.suffix not in (".shp", ".gpkg"):
         raise InputTypeError("file", ".shp or .gpkg")
 
-    target_df = gpd.read_file(fpath)
-    if target_df.crs is None:
-        raise MissingCRSError
-
-    if "undefined geographic" in target_df.crs.name.lower():
-        raise MissingCRSError
-
-    target_df = get_target_df(target_df, ["id", "start", "end", "geometry"])
+    target_df = get_target_df(read_geo(fpath), ["id", "start", "end", "geometry"])
     target_df["region"] = get_region(target_df)
-    target_df["dates"] = list(target_df[["start", "end"]].itertuples(index=False, name=None))
-    req_cols = get_required_cols("geometry", target_df.columns)
-    target_df = target_df[req_cols]
+    opt_cols = get_optional_cols(target_df.columns)
+    req_cols = ["id", "geometry", "start", "end", "region", *opt_cols]
 
     count = "1 geometry" if len(target_df) == 1 else f"{len(target_df)} geometries"
     click.echo(f"Found {count} in {fpath.resolve()}.")
 
     Path(save_dir).mkdir(parents=True, exist_ok=True)
     with click.progressbar(
-        target_df.itertuples(index=False, name=None),
-        label="Getting gridded climate data",
-        length=len(target_df),
-    ) as bar:
-        for i, *args in bar:
+        length=len(target_df), label="Getting gridded climate data"
+    ) as bar, ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = []
+        for i, geom, start, end, region, *args in zip(*(target_df[c].to_numpy() for c in req_cols)):
             fname = Path(save_dir, f"{i}.nc")
             if fname.exists():
+                bar.update(1)
                 continue
-            kwrgs = dict(zip(req_cols[1:], args))
-            clm = daymet.get_bygeom(
-                **kwrgs,
-                crs=target_df.crs,
-                variables=variables,
-                ssl=not disable_ssl,
+            kwrgs = {
+                "geometry": geom,
+                "dates": (start, end),
+                "region": region,
+                **dict(zip(opt_cols, args)),
+            }
+            futures.append(
+                executor.submit(
+                    _save_bygeom, fname, kwrgs, target_df.crs, variables, not disable_ssl
+                )
             )
-            clm.to_netcdf(fname)
+        _wait_for(futures, bar)
     click.echo("Done.")
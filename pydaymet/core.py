@@ -11,6 +11,7 @@ from typing import TYPE_CHECKING, Any, Callable, Iterable, TypeVar
 import numpy as np
 import numpy.typing as npt
 import pandas as pd
+import shapely
 import shapely.geometry as sgeom
 import xarray as xr
 
@@ -51,6 +52,13 @@ DATE_FMT = "%Y-%m-%d"
 # Default snow params from https://doi.org/10.5194/gmd-11-1077-2018
 T_RAIN = 2.5  # degC
 T_SNOW = 0.6  # degC
+REGION_BBOX = {
+    "na": sgeom.box(-136.8989, 6.0761, -6.1376, 69.077),
+    "hi": sgeom.box(-160.3055, 17.9539, -154.7715, 23.5186),
+    "pr": sgeom.box(-67.9927, 16.8443, -64.1195, 19.9381),
+}
+# Prepare the region boxes in-place, so intersects/contains queries use the prepared geometries
+shapely.prepare(list(REGION_BBOX.values()))
 
 __all__ = ["Daymet", "separate_snow"]
 
@@ -205,11 +213,7 @@ class Daymet:
         self.region = validated.region
         self.snow = validated.snow
 
-        self.region_bbox = {
-            "na": sgeom.box(-136.8989, 6.0761, -6.1376, 69.077),
-            "hi": sgeom.box(-160.3055, 17.9539, -154.7715, 23.5186),
-            "pr": sgeom.box(-67.9927, 16.8443, -64.1195, 19.9381),
-        }
+        self.region_bbox = dict(REGION_BBOX)
         if self.region == "pr":
             self.valid_start = pd.to_datetime("1950-01-01")
         else:
@@ -3,9 +3,15 @@
 from __future__ import annotations
 
 import functools
+import hashlib
 import io
 import itertools
+import json
+import os
 import re
+import tempfile
+import time
+from pathlib import Path
 from typing import TYPE_CHECKING, Callable, Generator, Iterable, Literal, Sequence, Union, cast
 
 import numpy as np
@@ -15,6 +21,7 @@ import xarray as xr
 import async_retriever as ar
 import pygeoogc as ogc
 import pygeoutils as geoutils
+from async_retriever.async_retriever import EXPIRE_AFTER
 from pydaymet.core import T_RAIN, T_SNOW, Daymet, separate_snow
 from pydaymet.exceptions import InputRangeError, InputTypeError, MissingDependencyError
 from pydaymet.pet import potential_et
@@ -22,8 +29,6 @@ from pygeoogc import ServiceError, ServiceURL
 from pygeoutils import Coordinates
 
 if TYPE_CHECKING:
-    from pathlib import Path
-
     import pyproj
     from shapely import MultiPolygon, Polygon
 
@@ -35,6 +40,7 @@ MAX_CONN = 10
 __all__ = ["get_bycoords", "get_bygeom", "get_bystac"]
 
 
+@functools.lru_cache(maxsize=8)
 def _get_filename(
     region: str,
 ) -> dict[int, Callable[[str], str]]:
@@ -83,26 +89,27 @@ def _coord_urls(
     generator
         An iterator of generated URLs.
     """
-    time_scale = _get_filename(region)
+    filename = _get_filename(region)[code]
 
     lon, lat = coord
     base_url = f"{ServiceURL().restful.daymet}/{code}"
+    dates_str = [(s.strftime(DATE_FMT), e.strftime(DATE_FMT), s.year) for s, e in dates]
     return (
         [
             (
-                f"{base_url}/daymet_v4_{time_scale[code](v)}_{s.year}.nc",
+                f"{base_url}/daymet_v4_{filename(v)}_{year}.nc",
                 {
                     "params": {
                         "var": v,
                         "longitude": f"{lon:0.6f}",
                         "latitude": f"{lat:0.6f}",
-                        "time_start": s.strftime(DATE_FMT),
-                        "time_end": e.strftime(DATE_FMT),
+                        "time_start": start,
+                        "time_end": end,
                         "accept": "csv",
                     }
                 },
             )
-            for s, e in dates
+            for start, end, year in dates_str
         ]
         for v in variables
     )
@@ -125,6 +132,14 @@ def _get_lon_lat(
     return list(lon), list(lat)
 
 
+def _read_csv_responses(responses: list[str]) -> pd.DataFrame:
+    """Parse csv responses of a single variable with one ``read_csv`` call."""
+    header, _, body = responses[0].partition("\n")
+    bodies = (body, *(r.partition("\n")[2] for r in responses[1:]))
+    csv = "\n".join([header, *(b.strip("\n") for b in bodies if b.strip())])
+    return pd.read_csv(io.StringIO(csv), parse_dates=[0], usecols=[0, 3], index_col=[0])
+
+
 def _by_coord(
     lon: float,
     lat: float,
@@ -142,15 +157,12 @@ def _by_coord(
     url_kwds = _coord_urls(
         daymet.time_codes[time_scale], coords, daymet.region, daymet.variables, dates
     )
-    retrieve = functools.partial(ar.retrieve_text, max_workers=MAX_CONN, ssl=ssl)
+    url_kwds = list(url_kwds)
+    urls, kwds = zip(*itertools.chain.from_iterable(url_kwds))
+    resp = ar.retrieve_text(list(urls), list(kwds), max_workers=MAX_CONN, ssl=ssl)
+    offsets = list(itertools.accumulate((len(u) for u in url_kwds), initial=0))
     clm = pd.concat(
-        (
-            pd.concat(
-                pd.read_csv(io.StringIO(r), parse_dates=[0], usecols=[0, 3], index_col=[0])
-                for r in retrieve(u, k)
-            )
-            for u, k in (zip(*u) for u in url_kwds)
-        ),
+        (_read_csv_responses(resp[i:j]) for i, j in zip(offsets[:-1], offsets[1:])),
         axis=1,
     )
     clm.columns = [c.replace('[unit="', " (").replace('"]', ")") for c in clm.columns]
@@ -158,7 +170,7 @@ def _by_coord(
     if "prcp (mm)" in clm:
         clm = clm.rename(columns={"prcp (mm)": "prcp (mm/day)"})
 
-    clm = clm.set_index(pd.to_datetime(clm.index.strftime("%Y-%m-%d")))
+    clm.index = clm.index.tz_localize(None).normalize()
     clm = clm.where(clm > -9999)
 
     if snow:
@@ -364,13 +376,14 @@ def _gridded_urls(
     generator
         An iterator of generated URLs.
     """
-    time_scale = _get_filename(region)
+    filename = _get_filename(region)[code]
 
     west, south, east, north = bounds
     base_url = f"{ServiceURL().restful.daymet}/{code}"
+    dates_str = [(s.strftime(DATE_FMT), e.strftime(DATE_FMT), s.year) for s, e in dates]
     return (
         (
-            f"{base_url}/daymet_v4_{time_scale[code](v)}_{s.year}.nc",
+            f"{base_url}/daymet_v4_{filename(v)}_{year}.nc",
             {
                 "params": {
                     "var": v,
@@ -380,22 +393,87 @@ def _gridded_urls(
                     "south": f"{south:0.6f}",
                     "disableProjSubset": "on",
                     "horizStride": "1",
-                    "time_start": s.strftime(DATE_FMT),
-                    "time_end": e.strftime(DATE_FMT),
+                    "time_start": start,
+                    "time_end": end,
                     "timeStride": "1",
                     "addLatLon": "true",
                     "accept": "netcdf",
                 }
             },
         )
-        for v, (s, e) in itertools.product(variables, dates)
+        for v, (start, end, year) in itertools.product(variables, dates_str)
     )
 
 
-def _open_dataset(f: Path) -> xr.Dataset:
-    """Open a dataset using ``xarray``."""
-    with xr.open_dataset(f, engine="scipy") as ds:
-        return ds.load()
+def _cached_download(
+    urls: list[str], kwds: list[dict[str, dict[str, str]]], ssl: bool
+) -> list[Path | None]:
+    """Download the NetCDF files that are not already in the cache directory.
+
+    The files are stored next to HyRiver's cache database and are reused
+    until they expire, based on ``HYRIVER_CACHE_EXPIRE`` (``-1`` means never).
+    Setting ``HYRIVER_CACHE_DISABLE`` to ``true`` forces all files to be downloaded.
+    Files are downloaded to unique temporary names and only renamed once they
+    are fully downloaded, so interrupted downloads are never reused and
+    concurrent calls for the same files do not overwrite each other.
+    """
+    cache_name = os.getenv("HYRIVER_CACHE_NAME", str(Path("cache", "aiohttp_cache.sqlite")))
+    root_dir = Path(cache_name).parent
+    fnames = [
+        Path(
+            root_dir,
+            hashlib.sha256(json.dumps([u, k], sort_keys=True).encode()).hexdigest() + ".nc",
+        )
+        for u, k in zip(urls, kwds)
+    ]
+
+    disable = os.getenv("HYRIVER_CACHE_DISABLE", "false").lower() == "true"
+    expire_after = int(os.getenv("HYRIVER_CACHE_EXPIRE", str(EXPIRE_AFTER)))
+    now = time.time()
+
+    def is_stale(f: Path) -> bool:
+        if disable or not f.exists():
+            return True
+        return expire_after != -1 and now - f.stat().st_mtime > expire_after
+
+    missing = [i for i, f in enumerate(fnames) if is_stale(f)]
+    failed: set[int] = set()
+    if missing:
+        root_dir.mkdir(parents=True, exist_ok=True)
+        tmp_files = []
+        for i in missing:
+            fd, tmp = tempfile.mkstemp(suffix=".part", prefix=fnames[i].stem, dir=root_dir)
+            os.close(fd)
+            tmp_files.append(Path(tmp))
+        try:
+            downloaded = ogc.streaming_download(
+                [urls[i] for i in missing],
+                [kwds[i] for i in missing],
+                fnames=tmp_files,
+                ssl=ssl,
+                n_jobs=MAX_CONN,
+            )
+            for i, f in zip(missing, downloaded):
+                if f is None:
+                    failed.add(i)
+                else:
+                    f.replace(fnames[i])
+        finally:
+            for f in tmp_files:
+                f.unlink(missing_ok=True)
+    # A failed file can still be valid if a concurrent call has just downloaded it
+    return [None if i in failed and is_stale(f) else f for i, f in enumerate(fnames)]
+
+
+def _open_dataset(f: Path | None) -> xr.Dataset:
+    """Open a dataset using ``xarray`` and remove it from the cache if it's invalid."""
+    try:
+        with xr.open_dataset(f, engine="scipy") as ds:
+            return ds.load()
+    except (ValueError, TypeError, OSError):
+        if f is not None:
+            f.unlink(missing_ok=True)
+        raise
 
 
 def get_bygeom(
@@ -509,7 +587,7 @@ def get_bygeom(
     crs = ogc.validate_crs(crs)
     _geometry = geoutils.geo2polygon(geometry, crs, 4326)
 
-    if not _geometry.intersects(daymet.region_bbox[region]):
+    if not daymet.region_bbox[region].intersects(_geometry):
         raise InputRangeError("geometry", f"within {daymet.region_bbox[region].bounds}")
 
     urls, kwds = zip(
@@ -524,18 +602,12 @@ def get_bygeom(
     urls = cast("list[str]", list(urls))
     kwds = cast("list[dict[str, dict[str, str]]]", list(kwds))
 
-    clm_files = ogc.streaming_download(
-        urls,
-        kwds,
-        file_extention="nc",
-        ssl=ssl,
-        n_jobs=MAX_CONN,
-    )
+    clm_files = _cached_download(urls, kwds, ssl)
     try:
         # open_mfdataset can run into too many open files error so we use merge
         # https://docs.xarray.dev/en/stable/user-guide/io.html#reading-multi-file-datasets
         clm = xr.merge(_open_dataset(f) for f in clm_files)
-    except ValueError as ex:
+    except (ValueError, TypeError, OSError) as ex:
         msg = " ".join(
             (
                 "Daymet did NOT process your request successfully.",
@@ -713,7 +785,7 @@ def get_bystac(
     daymet = Daymet(variables, pet, snow, time_scale, region)
 
     crs = ogc.validate_crs(crs)
-    if not geoutils.geo2polygon(geometry, crs, 4326).intersects(daymet.region_bbox[region]):
+    if not daymet.region_bbox[region].intersects(geoutils.geo2polygon(geometry, crs, 4326)):
         raise InputRangeError("geometry", f"within {daymet.region_bbox[region].bounds}")
 
     if not isinstance(res_km, int) or res_km < 1:
@@ -1,4 +1,5 @@
 import shutil
+import time
 from pathlib import Path
 
 import geopandas as gpd
@@ -14,7 +15,7 @@ from pydaymet import (
     MissingCRSError,
     MissingItemError,
 )
-from pydaymet.cli import cli
+from pydaymet.cli import cli, get_region, has_pyogrio
 
 GEOM = Polygon(
     [[-69.77, 45.07], [-69.31, 45.07], [-69.31, 45.45], [-69.77, 45.45], [-69.77, 45.07]]
@@ -77,6 +78,17 @@ def test_invalid_date_tuple():
     assert "(start, end)" in str(ex.value)
 
 
+def test_invalid_cli_region():
+    geodf = gpd.GeoDataFrame(
+        {"id": ["in", "out1", "out2"]},
+        geometry=gpd.points_from_xy([-69.77, 0, 100], [45.07, 0, -40]),
+        crs=4326,
+    )
+    with pytest.raises(InputRangeError) as ex:
+        _ = get_region(geodf)
+    assert "geometry ID of out1, out2 " in str(ex.value)
+
+
 class TestCLIFails:
     """Test the command-line interface exceptions."""
 
@@ -186,3 +198,97 @@ class TestCLIFails:
         assert ret.exit_code == 1
         assert isinstance(ret.exception, InputTypeError)
         assert "csv" in str(ret.exception)
+
+    @pytest.mark.parametrize(
+        "use_pyogrio",
+        [
+            pytest.param(
+                True,
+                marks=pytest.mark.skipif(
+                    not has_pyogrio, reason="requires pyogrio>=0.7 and geopandas>=0.14"
+                ),
+            ),
+            False,
+        ],
+    )
+    def test_geo_outside_daymet(self, runner, monkeypatch, use_pyogrio):
+        monkeypatch.setattr("pydaymet.cli.has_pyogrio", use_pyogrio)
+        params = {
+            "id": "geo_test",
+            "start": "2000-01-01",
+            "end": "2000-05-31",
+        }
+        geo_gpkg = Path("geo_outside_daymet.gpkg")
+        save_dir = "test_geo_outside_daymet"
+        geom = Polygon([[100, -40], [101, -40], [101, -39], [100, -39], [100, -40]])
+        gdf = gpd.GeoDataFrame(params, geometry=[geom], index=[0], crs=4326)
+        gdf.to_file(geo_gpkg)
+        ret = runner.invoke(
+            cli,
+            [
+                "geometry",
+                str(geo_gpkg),
+                "-s",
+                save_dir,
+            ],
+        )
+        geo_gpkg.unlink()
+        shutil.rmtree(save_dir, ignore_errors=True)
+        assert ret.exit_code == 1
+        assert isinstance(ret.exception, InputRangeError)
+        assert "NA:" in str(ret.exception)
+
+    def test_coords_validated_before_requests(self, runner, monkeypatch):
+        calls = []
+        monkeypatch.setattr("pydaymet.cli.CSV_CHUNKSIZE", 2)
+        monkeypatch.setattr("pydaymet.cli.daymet.get_bycoords", lambda **kwds: calls.append(kwds))
+        params = {
+            "id": ["a", "b", "c", "d"],
+            "lon": [-69.77, -69.77, -69.77, 0],
+            "lat": [45.07, 45.07, 45.07, 0],
+            "start": "2000-01-01",
+            "end": "2000-01-12",
+        }
+        coord_csv = "coords_outside.csv"
+        save_dir = "test_coords_validated"
+        pd.DataFrame(params).to_csv(coord_csv, index=False)
+        ret = runner.invoke(cli, ["coords", coord_csv, "-s", save_dir])
+        Path(coord_csv).unlink()
+        shutil.rmtree(save_dir, ignore_errors=True)
+        assert ret.exit_code == 1
+        assert isinstance(ret.exception, InputRangeError)
+        assert "geometry ID of d " in str(ret.exception)
+        assert not calls
+
+    @pytest.mark.parametrize(
+        ("error", "expected"),
+        [(InputRangeError("coords", "valid"), InputRangeError), (KeyboardInterrupt(), SystemExit)],
+        ids=["error", "ctrl-c"],
+    )
+    def test_cli_cancel_on_failure(self, runner, monkeypatch, error, expected):
+        calls = []
+
+        def get_bycoords(**kwds):
+            calls.append(kwds)
+            time.sleep(0.2)
+            raise error
+
+        monkeypatch.setattr("pydaymet.cli.MAX_WORKERS", 1)
+        monkeypatch.setattr("pydaymet.cli.daymet.get_bycoords", get_bycoords)
+        n_pts = 10
+        params = {
+            "id": [f"p{i}" for i in range(n_pts)],
+            "lon": -69.77,
+            "lat": 45.07,
+            "start": "2000-01-01",
+            "end": "2000-01-12",
+        }
+        coord_csv = "coords_cancel.csv"
+        save_dir = "test_cli_cancel_on_failure"
+        pd.DataFrame(params).to_csv(coord_csv, index=False)
+        ret = runner.invoke(cli, ["coords", coord_csv, "-s", save_dir])
+        Path(coord_csv).unlink()
+        shutil.rmtree(save_dir, ignore_errors=True)
+        assert ret.exit_code == 1
+        assert isinstance(ret.exception, expected)
+        assert len(calls) < n_pts
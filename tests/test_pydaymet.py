@@ -1,6 +1,9 @@
 """Tests for PyDaymet package."""
 import io
+import os
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import cytoolz.curried as tlz
@@ -8,10 +11,13 @@ import geopandas as gpd
 import numpy as np
 import pandas as pd
 import pytest
+import xarray as xr
 from shapely import Polygon
 
 import pydaymet as daymet
-from pydaymet.cli import cli
+from pydaymet.cli import cli, get_region, has_pyogrio
+from pydaymet.pydaymet import _cached_download, _read_csv_responses
+from pygeoogc import ServiceError
 
 GEOM = Polygon(
     [[-69.77, 45.07], [-69.31, 45.07], [-69.31, 45.45], [-69.77, 45.45], [-69.77, 45.07]]
@@ -147,6 +153,88 @@ class TestCLI:
         assert ret.exit_code == 0
         assert "Found 1 geometry" in ret.output
 
+    def test_geometry_projected(self, runner, monkeypatch):
+        calls = []
+
+        def get_bygeom(**kwds):
+            calls.append(kwds)
+            return xr.Dataset({"prcp": ("time", [0.0])})
+
+        monkeypatch.setattr("pydaymet.cli.daymet.get_bygeom", get_bygeom)
+        params = {"id": "geo_proj", "start": DAY[0], "end": DAY[1]}
+        geo_gpkg = Path("proj_geo.gpkg")
+        save_dir = "test_geometry_projected"
+        gdf = gpd.GeoDataFrame(params, geometry=[GEOM], index=[0], crs=DEF_CRS).to_crs(ALT_CRS)
+        gdf.to_file(geo_gpkg)
+        ret = runner.invoke(cli, ["geometry", str(geo_gpkg), "-s", save_dir])
+        geo_gpkg.unlink()
+        shutil.rmtree(save_dir, ignore_errors=True)
+        assert str(ret.exception) == "None"
+        assert ret.exit_code == 0
+        assert len(calls) == 1
+        assert calls[0]["region"] == "na"
+        assert calls[0]["crs"].to_epsg() == ALT_CRS
+
+    def test_geometry_albers(self, runner, monkeypatch):
+        calls = []
+
+        def get_bygeom(**kwds):
+            calls.append(kwds)
+            return xr.Dataset({"prcp": ("time", [0.0])})
+
+        monkeypatch.setattr("pydaymet.cli.daymet.get_bygeom", get_bygeom)
+        geoms = [
+            Polygon([[-81.5, 28.0], [-81.0, 28.0], [-81.0, 28.5], [-81.5, 28.5], [-81.5, 28.0]]),
+            Polygon([[-66.5, 18.1], [-66.2, 18.1], [-66.2, 18.3], [-66.5, 18.3], [-66.5, 18.1]]),
+            Polygon(
+                [[-134.6, 58.2], [-134.2, 58.2], [-134.2, 58.5], [-134.6, 58.5], [-134.6, 58.2]]
+            ),
+        ]
+        params = {"id": ["fl", "pr", "ak"], "start": DAY[0], "end": DAY[1]}
+        geo_gpkg = Path("albers_geo.gpkg")
+        save_dir = "test_geometry_albers"
+        gdf = gpd.GeoDataFrame(params, geometry=geoms, crs=DEF_CRS).to_crs(5070)
+        gdf.to_file(geo_gpkg)
+        ret = runner.invoke(cli, ["geometry", str(geo_gpkg), "-s", save_dir])
+        geo_gpkg.unlink()
+        shutil.rmtree(save_dir, ignore_errors=True)
+        assert str(ret.exception) == "None"
+        assert "Skipped" not in ret.output
+        assert "Found 3 geometries" in ret.output
+        assert sorted(c["region"] for c in calls) == ["na", "na", "na"]
+
+    @pytest.mark.parametrize(
+        "use_pyogrio",
+        [
+            pytest.param(
+                True,
+                marks=pytest.mark.skipif(
+                    not has_pyogrio, reason="requires pyogrio>=0.7 and geopandas>=0.14"
+                ),
+            ),
+            False,
+        ],
+    )
+    def test_geometry_skip_outside(self, runner, monkeypatch, use_pyogrio):
+        monkeypatch.setattr("pydaymet.cli.has_pyogrio", use_pyogrio)
+        monkeypatch.setattr(
+            "pydaymet.cli.daymet.get_bygeom", lambda **_: xr.Dataset({"prcp": ("time", [0.0])})
+        )
+        outside = Polygon([[100, -40], [101, -40], [101, -39], [100, -39], [100, -40]])
+        params = {"id": ["geo_in", "geo_out"], "start": DAY[0], "end": DAY[1]}
+        geo_gpkg = Path("skip_geo.gpkg")
+        save_dir = "test_geometry_skip"
+        gdf = gpd.GeoDataFrame(params, geometry=[GEOM, outside], crs=DEF_CRS)
+        gdf.to_file(geo_gpkg)
+        ret = runner.invoke(cli, ["geometry", str(geo_gpkg), "-s", save_dir])
+        saved = sorted(p.name for p in Path(save_dir).glob("*.nc"))
+        geo_gpkg.unlink()
+        shutil.rmtree(save_dir, ignore_errors=True)
+        assert ret.exit_code == 0
+        assert "Skipped 1 geometry outside" in ret.output
+        assert "Found 1 geometry" in ret.output
+        assert saved == ["geo_in.nc"]
+
     @pytest.mark.speedup()
     def test_coords(self, runner):
         params = {
@@ -191,6 +279,154 @@ class TestCLI:
         assert "Found coordinates of 1 point" in ret.output
 
 
+def test_get_region():
+    geodf = gpd.GeoDataFrame(
+        {"id": ["na", "hi", "na_poly"]},
+        geometry=[*gpd.points_from_xy([-69.77, -157.0], [45.07, 20.5]), GEOM],
+        crs=DEF_CRS,
+    )
+    assert get_region(geodf) == ["na", "hi", "na"]
+
+
+def test_read_csv_responses():
+    header = 'time,latitude[unit="degrees_north"],longitude[unit="degrees_east"],prcp[unit="mm"]'
+    rows = ["2000-01-01T12:00:00Z,45.07,-69.77,1.0", "2000-01-02T12:00:00Z,45.07,-69.77,2.0"]
+    responses = [
+        "\r\n".join([header, *rows, ""]),
+        f"{header}\r\n",
+        f"{header}\n2001-01-01T12:00:00Z,45.07,-69.77,3.0",
+        header,
+    ]
+    clm = _read_csv_responses(responses)
+    assert clm.columns.tolist() == ['prcp[unit="mm"]']
+    assert clm.index.strftime("%Y-%m-%d").tolist() == ["2000-01-01", "2000-01-02", "2001-01-01"]
+    assert clm.iloc[:, 0].tolist() == [1.0, 2.0, 3.0]
+    assert _read_csv_responses([f"{header}\r\n"]).empty
+
+
+class TestCachedDownload:
+    """Test caching the gridded files offline."""
+
+    urls = ["https://daymet/a.nc", "https://daymet/b.nc"]
+    kwds = [{"params": {"var": "prcp"}}, {"params": {"var": "tmin"}}]
+
+    @pytest.fixture()
+    def downloads(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("HYRIVER_CACHE_NAME", str(tmp_path / "aiohttp_cache.sqlite"))
+        monkeypatch.delenv("HYRIVER_CACHE_DISABLE", raising=False)
+        monkeypatch.delenv("HYRIVER_CACHE_EXPIRE", raising=False)
+        calls = []
+
+        def streaming_download(urls, kwds, fnames, ssl, n_jobs):
+            calls.append(list(urls))
+            for f in fnames:
+                Path(f).write_bytes(b"CDF")
+            return fnames
+
+        monkeypatch.setattr("pydaymet.pydaymet.ogc.streaming_download", streaming_download)
+        return calls
+
+    def test_hit(self, downloads):
+        files = _cached_download(self.urls, self.kwds, True)
+        assert _cached_download(self.urls, self.kwds, True) == files
+        assert downloads == [self.urls]
+        assert all(f.suffix == ".nc" for f in files)
+
+    def test_expire(self, downloads, monkeypatch):
+        files = _cached_download(self.urls, self.kwds, True)
+        os.utime(files[0], (0, 0))
+        _ = _cached_download(self.urls, self.kwds, True)
+        monkeypatch.setenv("HYRIVER_CACHE_EXPIRE", "-1")
+        os.utime(files[1], (0, 0))
+        _ = _cached_download(self.urls, self.kwds, True)
+        assert downloads == [self.urls, self.urls[:1]]
+
+    def test_disable(self, downloads, monkeypatch):
+        _ = _cached_download(self.urls, self.kwds, True)
+        monkeypatch.setenv("HYRIVER_CACHE_DISABLE", "true")
+        _ = _cached_download(self.urls, self.kwds, True)
+        assert downloads == [self.urls, self.urls]
+
+    def test_interrupted(self, downloads, monkeypatch, tmp_path):
+        def interrupted(urls, kwds, fnames, ssl, n_jobs):
+            Path(fnames[0]).write_bytes(b"CD")
+            raise ConnectionError
+
+        with monkeypatch.context() as m:
+            m.setattr("pydaymet.pydaymet.ogc.streaming_download", interrupted)
+            with pytest.raises(ConnectionError):
+                _ = _cached_download(self.urls, self.kwds, True)
+        assert not list(tmp_path.glob("*.nc"))
+        assert not list(tmp_path.glob("*.part"))
+        _ = _cached_download(self.urls, self.kwds, True)
+        assert downloads == [self.urls]
+
+    def test_failed(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("HYRIVER_CACHE_NAME", str(tmp_path / "aiohttp_cache.sqlite"))
+        monkeypatch.setattr(
+            "pydaymet.pydaymet.ogc.streaming_download", lambda urls, kwds, **_: [None] * len(urls)
+        )
+        assert _cached_download(self.urls, self.kwds, True) == [None, None]
+        assert not list(tmp_path.iterdir())
+
+    def test_concurrent(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("HYRIVER_CACHE_NAME", str(tmp_path / "aiohttp_cache.sqlite"))
+        barrier = threading.Barrier(2)
+
+        def streaming_download(urls, kwds, fnames, ssl, n_jobs):
+            barrier.wait(timeout=5)
+            for f in fnames:
+                Path(f).write_bytes(b"CDF")
+            barrier.wait(timeout=5)
+            return fnames
+
+        monkeypatch.setattr("pydaymet.pydaymet.ogc.streaming_download", streaming_download)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = list(
+                executor.map(lambda _: _cached_download(self.urls, self.kwds, True), range(2))
+            )
+        assert results[0] == results[1]
+        assert all(f is not None and f.read_bytes() == b"CDF" for f in results[0])
+
+    @pytest.mark.parametrize("body", ["truncated", "html"])
+    def test_corrupt(self, monkeypatch, tmp_path, body):
+        monkeypatch.setenv("HYRIVER_CACHE_NAME", str(tmp_path / "aiohttp_cache.sqlite"))
+        if body == "truncated":
+            nc = xr.Dataset({"prcp": ("time", np.arange(100.0))}).to_netcdf(engine="scipy")
+            content = nc[: len(nc) // 2]
+        else:
+            content = b"<html>Internal Server Error</html>"
+        calls = []
+
+        def streaming_download(urls, kwds, fnames, ssl, n_jobs):
+            calls.append(list(urls))
+            for f in fnames:
+                Path(f).write_bytes(content)
+            return fnames
+
+        monkeypatch.setattr("pydaymet.pydaymet.ogc.streaming_download", streaming_download)
+        for _ in range(2):
+            with pytest.raises(ServiceError):
+                _ = daymet.get_bygeom(GEOM, DAY, variables="prcp")
+            assert not list(tmp_path.glob("*.nc"))
+        assert len(calls) == 2
+
+    def test_corrupt_keeps_valid(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("HYRIVER_CACHE_NAME", str(tmp_path / "aiohttp_cache.sqlite"))
+        nc = xr.Dataset({"prcp": ("time", np.arange(100.0))}).to_netcdf(engine="scipy")
+
+        def streaming_download(urls, kwds, fnames, ssl, n_jobs):
+            Path(fnames[0]).write_bytes(nc)
+            for f in fnames[1:]:
+                Path(f).write_bytes(b"<html>Internal Server Error</html>")
+            return fnames
+
+        monkeypatch.setattr("pydaymet.pydaymet.ogc.streaming_download", streaming_download)
+        with pytest.raises(ServiceError):
+            _ = daymet.get_bygeom(GEOM, DAY, variables=VAR)
+        assert len(list(tmp_path.glob("*.nc"))) == 1
+
+
 def test_show_versions():
     f = io.StringIO()
     daymet.show_versions(file=f)